@@ -6,14 +6,16 @@ Duplicate Photo Manager - Eenvoudige Gecombineerde App
 import sys
 import os
 import sqlite3
-import imagehash
-from PIL import Image, ExifTags
+import numpy as np
+from numba import njit
+from PIL import Image, UnidentifiedImageError
 import pillow_heif
 from datetime import datetime
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
-from pathlib import Path
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache, partial
+from operator import itemgetter
 from collections import defaultdict
 import subprocess
 import platform
@@ -21,11 +23,14 @@ import platform
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFileDialog, QMessageBox, QProgressBar,
-    QLineEdit, QTabWidget, QScrollArea, QFrame, QGridLayout,
+    QLineEdit, QTabWidget, QListView, QAbstractItemView,
     QSizePolicy, QSpacerItem, QTextEdit, QGroupBox
 )
-from PySide6.QtGui import QPixmap, QFont
-from PySide6.QtCore import Qt, Signal, QThread
+from PySide6.QtGui import QPixmap, QFont, QImageReader
+from PySide6.QtCore import (
+    Qt, Signal, QThread, QObject, QRunnable, QThreadPool, QSize,
+    QAbstractListModel, QModelIndex
+)
 
 # Register HEIF support
 pillow_heif.register_heif_opener()
@@ -33,13 +38,207 @@ pillow_heif.register_heif_opener()
 # Image extensions
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.heic', '.heif', '.bmp', '.gif', '.webp', '.tiff', '.tif'}
 
+# Cache map voor thumbnails van de resultaten-UI
+THUMB_DIR = os.path.expanduser("~/.cache/dupfinder")
+
+def _dct_matrix():
+    """Orthonormale 32-punts DCT-II cosinusmatrix"""
+    n = np.arange(32, dtype=np.float64)
+    mat = np.cos(np.pi * (2.0 * n[None, :] + 1.0) * n[:, None] / 64.0) * np.sqrt(2.0 / 32.0)
+    mat[0] /= np.sqrt(2.0)
+    return mat.astype(np.float32)
+
+_DCT_COS = _dct_matrix()
+
+@njit(cache=True, fastmath=True)
+def _phash_kernel(pixels, cos_mat):
+    """DCT + mediaan + bit-packing als één gecompileerde kernel"""
+    # Separabele 2D DCT met expliciete lussen - np.dot zou via scipy's
+    # BLAS-bindings lopen en op 32x32 levert BLAS toch niets op. Alleen
+    # de 8 laagfrequente rijen/kolommen worden berekend.
+    tmp = np.empty((8, 32), dtype=np.float32)
+    for i in range(8):
+        for j in range(32):
+            acc = np.float32(0.0)
+            for k in range(32):
+                acc += cos_mat[i, k] * pixels[k, j]
+            tmp[i, j] = acc
+
+    dct = np.empty((8, 8), dtype=np.float32)
+    for i in range(8):
+        for j in range(8):
+            acc = np.float32(0.0)
+            for k in range(32):
+                acc += tmp[i, k] * cos_mat[j, k]
+            dct[i, j] = acc
+
+    # Mediaan van de 63 laagfrequente coefficienten (DC telt niet mee),
+    # met een insertion sort - np.median is overkill op deze schaal
+    coeffs = np.empty(63, dtype=np.float32)
+    idx = 0
+    for i in range(8):
+        for j in range(8):
+            if i > 0 or j > 0:
+                coeffs[idx] = dct[i, j]
+                idx += 1
+    for i in range(1, 63):
+        v = coeffs[i]
+        j = i - 1
+        while j >= 0 and coeffs[j] > v:
+            coeffs[j + 1] = coeffs[j]
+            j -= 1
+        coeffs[j + 1] = v
+    med = coeffs[31]
+
+    # Pack de 64 vergelijkingsbits in een signed 64-bit hash (SQLite INTEGER)
+    h = np.int64(0)
+    bit = 0
+    for i in range(8):
+        for j in range(8):
+            if dct[i, j] > med:
+                h |= np.int64(1) << bit
+            bit += 1
+    return h
+
+# Eén keer compileren bij import; cache=True hergebruikt de compilatie
+# in de worker processen
+_phash_kernel(np.zeros((32, 32), dtype=np.float32), _DCT_COS)
+
+def _phash_from_array(pixels):
+    """Bereken 64-bit pHash uit 32x32 grijswaarden: 2D DCT, 8x8 laagfrequent blok
+
+    Draait in een worker proces; alleen dit numerieke deel houdt de GIL
+    vast, dus dit is het enige stuk dat naar een proces moet.
+    """
+    return int(_phash_kernel(pixels, _DCT_COS))
+
+def process_one(item, hashers):
+    """Hash, metadata en thumbnail voor één bestand (draait in een decoder-thread)
+
+    Eén Image.open per bestand: dezelfde decode levert de pHash, de
+    metadata én een kleine JPEG thumbnail voor de resultaten-UI, zodat
+    het origineel later niet opnieuw gedecodeerd hoeft te worden.
+    PIL/libjpeg/libheif laten de GIL los tijdens het decoderen; de DCT
+    gaat als 32x32 array naar het hashers-procespool.
+    """
+    path, file_size, mtime = item
+    try:
+        date_modified = datetime.fromtimestamp(mtime).isoformat()
+
+        with Image.open(path) as img:
+            width, height = img.size
+
+            # EXIF datum - 0x0132 is het DateTime tag, direct opvragen
+            # in plaats van alle tags langslopen
+            date_taken = None
+            try:
+                value = img.getexif().get(0x0132)
+                if value:
+                    date_taken = datetime.strptime(value, '%Y:%m:%d %H:%M:%S').isoformat()
+            except (OSError, ValueError, TypeError):
+                pass  # kapotte of afwijkende EXIF, datum blijft leeg
+
+            gray = img.convert('L').resize((32, 32), Image.BILINEAR)
+            pixels = np.asarray(gray, dtype=np.float32)
+            # Deze thread wacht op de DCT; andere threads decoderen door
+            img_hash = hashers.submit(_phash_from_array, pixels).result()
+
+            # Thumbnail keyed op hash: bijna-identieke beelden delen er één
+            thumb_path = os.path.join(THUMB_DIR, f"{img_hash & 0xFFFFFFFFFFFFFFFF:016x}.jpg")
+            if not os.path.exists(thumb_path):
+                thumb = img if img.mode == 'RGB' else img.convert('RGB')
+                thumb.thumbnail((200, 200), Image.BILINEAR)
+                # Exacte duplicaten delen een thumb-pad en worden vaak
+                # tegelijk verwerkt; via een uniek tempbestand + rename
+                # kan er nooit een half geschreven thumb achterblijven
+                tmp_path = f"{thumb_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                thumb.save(tmp_path, "JPEG", quality=75, optimize=False)
+                os.replace(tmp_path, thumb_path)
+
+        metadata = {
+            "resolution": f"{width}x{height}",
+            "width": width,
+            "height": height,
+            "file_size": file_size,
+            "date_taken": date_taken,
+            "date_modified": date_modified,
+            "thumb_path": thumb_path
+        }
+        return path, img_hash, metadata
+    except (OSError, UnidentifiedImageError, SyntaxError, ValueError,
+            Image.DecompressionBombError):
+        # Onleesbaar of geweigerd bestand (DecompressionBombError komt van
+        # geldige beelden boven ~178MP; sommige decoders gooien ValueError
+        # op kapotte data): sentinel teruggeven, de scan loop logt het.
+        # Bewust geen bare except - dat vangt ook KeyboardInterrupt
+        return path, None, None
+
+def hamming_distance(a, b):
+    """Hamming-afstand tussen twee (signed) 64-bit hashes"""
+    return ((a ^ b) & 0xFFFFFFFFFFFFFFFF).bit_count()
+
+class BKTree:
+    """BK-tree over 64-bit pHashes voor near-neighbor queries
+
+    Opzoeken van alle hashes binnen Hamming-afstand k kost ~O(log N)
+    per query in plaats van de hele verzameling langslopen.
+    """
+
+    def __init__(self, hashes=()):
+        self.root = None  # [hash, {afstand: kind-node}]
+        for h in hashes:
+            self.add(h)
+
+    def add(self, h):
+        if self.root is None:
+            self.root = [h, {}]
+            return
+        node = self.root
+        while True:
+            dist = hamming_distance(h, node[0])
+            if dist == 0:
+                return  # hash zit er al in
+            child = node[1].get(dist)
+            if child is None:
+                node[1][dist] = [h, {}]
+                return
+            node = child
+
+    def find(self, h, k):
+        """Alle opgeslagen hashes binnen Hamming-afstand k van h"""
+        matches = []
+        if self.root is None:
+            return matches
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            dist = hamming_distance(h, node[0])
+            if dist <= k:
+                matches.append(node[0])
+            for d, child in node[1].items():
+                # Driehoeksongelijkheid: alleen deze takken kunnen matches bevatten
+                if dist - k <= d <= dist + k:
+                    stack.append(child)
+        return matches
+
 class ScanThread(QThread):
     """Background thread voor het scannen"""
     
     progress_text = Signal(str)
     progress_value = Signal(int)
     finished_scan = Signal(bool, str)  # success, message
-    
+
+    # Aantal rijen per executemany-batch; het prepared statement wordt
+    # door sqlite3 hergebruikt, dus kleine batches kosten vrijwel niets
+    BATCH_SIZE = 500
+
+    # Maximale Hamming-afstand tussen pHashes om als duplicaat te tellen
+    HAMMING_THRESHOLD = 8
+
+    # Aantal threads dat tegelijk mappen doorloopt
+    WALK_WORKERS = 8
+
+
     def __init__(self, source_folder, db_path):
         super().__init__()
         self.source_folder = source_folder
@@ -51,16 +250,27 @@ class ScanThread(QThread):
     
     def run(self):
         try:
-            self.scan_for_duplicates()
+            # Eén verbinding voor de hele scan; autocommit zodat we zelf
+            # BEGIN/COMMIT rond batches kunnen zetten
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA mmap_size=268435456")
+                conn.execute("PRAGMA cache_size=-131072")
+                self.scan_for_duplicates(conn)
+            finally:
+                conn.close()
         except Exception as e:
             self.finished_scan.emit(False, f"Fout tijdens scannen: {str(e)}")
-    
-    def scan_for_duplicates(self):
+
+    def scan_for_duplicates(self, conn):
         """Scan voor duplicaten (vereenvoudigde versie)"""
-        
+
         # Setup database
         self.progress_text.emit("Database voorbereiden...")
-        self.setup_database()
+        self.setup_database(conn)
         
         # Scan bestanden
         self.progress_text.emit("Bestanden zoeken...")
@@ -70,69 +280,123 @@ class ScanThread(QThread):
             self.finished_scan.emit(False, "Geen afbeeldingen gevonden!")
             return
         
-        self.progress_text.emit(f"Verwerken van {len(image_files)} afbeeldingen...")
+        # Size-prefilter: een bestand met een unieke grootte (afgerond
+        # op 1KB) kan geen duplicaat zijn en hoeft niet gehasht te worden
+        size_buckets = defaultdict(list)
+        for item in image_files:
+            size_buckets[item[1] // 1024].append(item)
+
+        to_hash = []
+        skipped_rows = []
+        for bucket in size_buckets.values():
+            if len(bucket) > 1:
+                to_hash.extend(bucket)
+            else:
+                path, file_size, mtime = bucket[0]
+                skipped_rows.append((
+                    path, path.rsplit(os.sep, 1)[-1], None, None, None, None,
+                    file_size, None, datetime.fromtimestamp(mtime).isoformat(), None
+                ))
+
+        if skipped_rows:
+            self.flush_image_rows(conn, skipped_rows)
+
+        self.progress_text.emit(f"Hashen van {len(to_hash)} van de {len(image_files)} afbeeldingen...")
+        os.makedirs(THUMB_DIR, exist_ok=True)
         
-        # Process images
+        # Process images - threads decoderen (IO + libjpeg zonder GIL),
+        # een procespool doet de DCT's; DB writes blijven op deze thread
         processed = 0
         hash_to_images = defaultdict(list)
-        
-        for filepath in image_files:
-            if self.should_stop:
-                return
-            
-            try:
-                img_hash = self.get_image_hash(filepath)
-                if img_hash:
-                    metadata = self.get_metadata(filepath)
-                    
+        pending_rows = []
+        failed_files = []
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as hashers, \
+             ThreadPoolExecutor(max_workers=2 * os.cpu_count()) as decoders:
+            for filepath, img_hash, metadata in decoders.map(partial(process_one, hashers=hashers), to_hash):
+                if self.should_stop:
+                    decoders.shutdown(wait=False, cancel_futures=True)
+                    hashers.shutdown(wait=False, cancel_futures=True)
+                    return
+
+                if img_hash is not None:
                     image_data = {
                         "path": filepath,
-                        "hash": str(img_hash),
-                        "filename": os.path.basename(filepath),
+                        "hash": img_hash,
+                        "filename": filepath.rsplit(os.sep, 1)[-1],
                         **metadata
                     }
-                    
-                    self.save_image_to_db(image_data)
-                    hash_to_images[str(img_hash)].append(image_data)
-                
+                    # Sorteersleutel alvast berekenen; scheelt een lambda
+                    # en string-allocaties per vergelijking bij het groeperen
+                    image_data["_sortkey"] = (
+                        image_data["width"] * image_data["height"],
+                        image_data["date_taken"] or ''
+                    )
+
+                    pending_rows.append(self.image_row(image_data))
+                    if len(pending_rows) >= self.BATCH_SIZE:
+                        self.flush_image_rows(conn, pending_rows)
+                        pending_rows = []
+                    hash_to_images[img_hash].append(image_data)
+                else:
+                    failed_files.append(filepath)
+
                 processed += 1
-                progress = int((processed / len(image_files)) * 80)  # 80% voor processing
+                progress = int((processed / len(to_hash)) * 80)  # 80% voor processing
                 self.progress_value.emit(progress)
-                
-            except Exception as e:
-                print(f"Fout bij {filepath}: {e}")
-                continue
-        
-        # Find duplicates
+
+        # Laatste (deel)batch wegschrijven
+        if pending_rows:
+            self.flush_image_rows(conn, pending_rows)
+            pending_rows = []
+
+        # Onleesbare bestanden achteraf in één keer rapporteren
+        if failed_files:
+            print(f"{len(failed_files)} bestanden konden niet gelezen worden:")
+            for path in failed_files:
+                print(f"  {path}")
+
+        # Indexen pas bouwen nu alle rijen er staan
+        self.create_indexes(conn)
+
+        # Find duplicates - ook bijna-duplicaten (Hamming-afstand)
         self.progress_text.emit("Duplicaten zoeken...")
         duplicate_count = 0
-        
-        for img_hash, images in hash_to_images.items():
+        total_duplicates = 0
+        group_updates = []
+
+        sortkey = itemgetter('_sortkey')
+        conn.execute("BEGIN")
+        for cluster in self.group_similar_hashes(list(hash_to_images)):
+            images = [img for h in cluster for img in hash_to_images[h]]
             if len(images) > 1:
                 # Bepaal origineel
-                images.sort(key=lambda x: (x['width'] * x['height'], x['date_taken'] or ''), reverse=True)
-                
+                images.sort(key=sortkey, reverse=True)
+
                 # Maak groep
-                group_id = self.create_duplicate_group(img_hash, images)
-                
+                group_id = self.create_duplicate_group(conn, images[0]['hash'], images)
+
                 # Update images - GEEN origineel meer, alles is verwijderbaar
-                for img in images:
-                    self.update_image_group(img['path'], group_id, False)  # Alles op False
-                
+                group_updates.extend((group_id, img['path']) for img in images)
+
                 duplicate_count += 1
+                total_duplicates += len(images) - 1
+
+        conn.executemany("""
+            UPDATE images SET group_id = ?, is_original = FALSE WHERE path = ?
+        """, group_updates)
+        conn.execute("COMMIT")
         
         self.progress_value.emit(100)
         
         if duplicate_count == 0:
             self.finished_scan.emit(True, "Geen duplicaten gevonden! Alle afbeeldingen zijn uniek.")
         else:
-            total_duplicates = sum(len(images) - 1 for images in hash_to_images.values() if len(images) > 1)
             self.finished_scan.emit(True, f"Scan voltooid!\n{duplicate_count} groepen met {total_duplicates} duplicaten gevonden.")
     
-    def setup_database(self):
+    def setup_database(self, conn):
         """Setup database tabellen"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript("""
+        conn.executescript("""
                 DROP TABLE IF EXISTS images;
                 DROP TABLE IF EXISTS duplicate_groups;
                 
@@ -140,13 +404,14 @@ class ScanThread(QThread):
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     path TEXT UNIQUE NOT NULL,
                     filename TEXT NOT NULL,
-                    hash TEXT NOT NULL,
+                    hash INTEGER,
                     resolution TEXT,
                     width INTEGER,
                     height INTEGER,
                     file_size INTEGER,
                     date_taken TEXT,
                     date_modified TEXT,
+                    thumb_path TEXT,
                     is_original BOOLEAN DEFAULT FALSE,
                     group_id INTEGER,
                     is_deleted BOOLEAN DEFAULT FALSE
@@ -154,188 +419,197 @@ class ScanThread(QThread):
                 
                 CREATE TABLE duplicate_groups (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    hash TEXT NOT NULL,
+                    hash INTEGER NOT NULL,
                     image_count INTEGER,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 );
-                
-                CREATE INDEX idx_hash ON images(hash);
-                CREATE INDEX idx_group_id ON images(group_id);
-                CREATE INDEX idx_path ON images(path);
             """)
+
+    def create_indexes(self, conn):
+        """Maak indexen aan - pas NA de bulk insert, dat is flink sneller"""
+        conn.executescript("""
+            CREATE INDEX idx_hash ON images(hash);
+            CREATE INDEX idx_group_id ON images(group_id);
+            CREATE INDEX idx_path ON images(path);
+        """)
     
     def find_image_files(self):
-        """Vind alle afbeeldingen"""
-        folder_path = Path(self.source_folder)
+        """Vind alle afbeeldingen; submappen worden parallel doorlopen
+
+        Elke worker-thread doet één directory per keer en levert de
+        submappen weer in bij de pool, zodat de per-directory syscall-
+        latency (NFS, koude cache) overlapt. Levert (pad, grootte,
+        mtime) tuples; de stat-informatie zit al in het os.scandir
+        resultaat, dus verderop is geen losse os.stat per bestand nodig.
+        """
         image_files = []
-        
-        for ext in IMAGE_EXTENSIONS:
-            pattern = f"**/*{ext}"
-            files = list(folder_path.glob(pattern))
-            image_files.extend([str(f) for f in files if f.is_file()])
-            
-            pattern = f"**/*{ext.upper()}"
-            files = list(folder_path.glob(pattern))
-            image_files.extend([str(f) for f in files if f.is_file()])
-        
-        return list(set(image_files))
-    
-    def get_image_hash(self, path):
-        """Bereken image hash"""
-        try:
-            with Image.open(path) as img:
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                return imagehash.phash(img, hash_size=16)
-        except:
-            return None
-    
-    def get_metadata(self, path):
-        """Verkrijg metadata"""
-        try:
-            stat = os.stat(path)
-            size = stat.st_size
-            date_modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
-            
-            with Image.open(path) as img:
-                width, height = img.size
-                resolution = f"{width}x{height}"
-                
-                # EXIF datum
-                date_taken = None
-                try:
-                    if hasattr(img, '_getexif') and img._getexif():
-                        exif = img._getexif()
-                        for tag, value in exif.items():
-                            if ExifTags.TAGS.get(tag) == 'DateTime':
-                                date_taken = datetime.strptime(value, '%Y:%m:%d %H:%M:%S').isoformat()
-                                break
-                except:
-                    pass
-                
-                return {
-                    "resolution": resolution,
-                    "width": width,
-                    "height": height,
-                    "file_size": size,
-                    "date_taken": date_taken,
-                    "date_modified": date_modified
-                }
-        except:
-            return {
-                "resolution": "unknown",
-                "width": 0,
-                "height": 0,
-                "file_size": 0,
-                "date_taken": None,
-                "date_modified": None
-            }
-    
-    def save_image_to_db(self, image_data):
-        """Sla afbeelding op in database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO images 
-                (path, filename, hash, resolution, width, height, file_size, date_taken, date_modified)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                image_data["path"], image_data["filename"], image_data["hash"],
-                image_data["resolution"], image_data["width"], image_data["height"],
-                image_data["file_size"], image_data["date_taken"], image_data["date_modified"]
-            ))
+        lock = threading.Lock()
+
+        def walk_dir(folder):
+            subdirs = []
+            found = []
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                            stat = entry.stat()
+                            found.append((entry.path, stat.st_size, stat.st_mtime))
+            except OSError:
+                pass  # map niet leesbaar, overslaan
+            if found:
+                with lock:
+                    image_files.extend(found)
+            return subdirs
+
+        with ThreadPoolExecutor(max_workers=self.WALK_WORKERS) as pool:
+            pending = {pool.submit(walk_dir, self.source_folder)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for subdir in future.result():
+                        pending.add(pool.submit(walk_dir, subdir))
+
+        return image_files
     
-    def create_duplicate_group(self, img_hash, images):
+    @classmethod
+    def group_similar_hashes(cls, hashes):
+        """Cluster hashes met Hamming-afstand <= HAMMING_THRESHOLD
+
+        Een BK-tree levert per hash alle buren binnen de drempel op;
+        buren worden met union-find tot clusters samengevoegd. Anders
+        dan bucketen op een bit-prefix mist dit geen paren die juist in
+        die prefix-bits verschillen.
+        """
+        tree = BKTree(hashes)
+        parent = {h: h for h in hashes}
+
+        def find(h):
+            while parent[h] != h:
+                parent[h] = parent[parent[h]]  # pad halveren
+                h = parent[h]
+            return h
+
+        for h in hashes:
+            for other in tree.find(h, cls.HAMMING_THRESHOLD):
+                root_a, root_b = find(h), find(other)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+
+        clusters = defaultdict(list)
+        for h in hashes:
+            clusters[find(h)].append(h)
+        return list(clusters.values())
+
+    @staticmethod
+    def image_row(image_data):
+        """Maak een insert-tuple van image data"""
+        return (
+            image_data["path"], image_data["filename"], image_data["hash"],
+            image_data["resolution"], image_data["width"], image_data["height"],
+            image_data["file_size"], image_data["date_taken"], image_data["date_modified"],
+            image_data["thumb_path"]
+        )
+
+    def flush_image_rows(self, conn, rows):
+        """Schrijf een batch afbeeldingen weg in één transactie"""
+        conn.execute("BEGIN")
+        conn.executemany("""
+            INSERT OR REPLACE INTO images
+            (path, filename, hash, resolution, width, height, file_size, date_taken, date_modified, thumb_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.execute("COMMIT")
+
+    def create_duplicate_group(self, conn, img_hash, images):
         """Maak duplicate groep"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO duplicate_groups (hash, image_count) VALUES (?, ?)
-            """, (img_hash, len(images)))
-            return cursor.lastrowid
-    
-    def update_image_group(self, path, group_id, is_original):
-        """Update image met groep info"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE images SET group_id = ?, is_original = ? WHERE path = ?
-            """, (group_id, is_original, path))
-
-class ImageCard(QFrame):
-    """Eenvoudige image card - alles is verwijderbaar"""
-    
-    deleteRequested = Signal(str)
-    
-    def __init__(self, image_data):
+        cursor = conn.execute("""
+            INSERT INTO duplicate_groups (hash, image_count) VALUES (?, ?)
+        """, (img_hash, len(images)))
+        return cursor.lastrowid
+
+class ThumbnailLoader(QRunnable):
+    """Decodeer een afbeelding op doelformaat buiten de GUI-thread
+
+    QImageReader.setScaledSize laat de codec zelf schalen (DCT-domein
+    schaling bij libjpeg), dus er wordt nooit op volle resolutie
+    gedecodeerd en de event loop blokkeert niet.
+    """
+
+    class Signals(QObject):
+        loaded = Signal(object)  # QImage, of null bij een leesfout
+
+    def __init__(self, path, target_size):
         super().__init__()
-        self.image_data = image_data
-        self.setup_ui()
-    
-    def setup_ui(self):
-        self.setFixedSize(200, 250)
-        
-        # Alle cards hebben dezelfde styling - geen origineel onderscheid
-        self.setStyleSheet("QFrame { border: 2px solid #444; border-radius: 8px; background: #2a2a2a; }")
-        
-        layout = QVBoxLayout(self)
-        layout.setSpacing(5)
-        layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Geen origineel badge meer
-        
-        # Afbeelding
-        img_label = QLabel()
-        img_label.setFixedHeight(120)
-        img_label.setStyleSheet("border: 1px solid #333; border-radius: 4px; background: #1a1a1a;")
-        
-        try:
-            pixmap = QPixmap(self.image_data["path"])
-            if not pixmap.isNull():
-                pixmap = pixmap.scaled(180, 110, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                img_label.setPixmap(pixmap)
-                img_label.setAlignment(Qt.AlignCenter)
-                img_label.setCursor(Qt.PointingHandCursor)
-                img_label.mousePressEvent = lambda e: self.open_image()
-        except:
-            img_label.setText("Kan niet laden")
-            img_label.setAlignment(Qt.AlignCenter)
-            img_label.setStyleSheet(img_label.styleSheet() + "color: #ff6b6b;")
-        
-        layout.addWidget(img_label)
-        
-        # Info
-        filename = QLabel(os.path.basename(self.image_data["path"])[:20] + "...")
-        filename.setStyleSheet("color: white; font-size: 10px;")
-        layout.addWidget(filename)
-        
-        size_kb = round(self.image_data.get("file_size", 0) / 1024)
-        size_text = f"{size_kb} KB" if size_kb < 1024 else f"{round(size_kb/1024, 1)} MB"
-        size_label = QLabel(f"{self.image_data.get('resolution', 'unknown')} • {size_text}")
-        size_label.setStyleSheet("color: #ccc; font-size: 9px;")
-        layout.addWidget(size_label)
-        
-        # Iedereen krijgt een delete knop
-        delete_btn = QPushButton("Verwijderen")
-        delete_btn.setFixedHeight(24)
-        delete_btn.setStyleSheet("""
-            QPushButton { 
-                background: #cc3333; color: white; border: none; 
-                border-radius: 4px; font-size: 9px; 
-            }
-            QPushButton:hover { background: #dd4444; }
-        """)
-        delete_btn.clicked.connect(lambda: self.deleteRequested.emit(self.image_data["path"]))
-        layout.addWidget(delete_btn)
-    
-    def open_image(self):
-        """Open afbeelding in standaard app"""
-        try:
-            if platform.system() == "Darwin":
-                subprocess.run(["open", self.image_data["path"]])
-            elif platform.system() == "Windows":
-                os.startfile(self.image_data["path"])
-            else:
-                subprocess.run(["xdg-open", self.image_data["path"]])
-        except:
-            QMessageBox.warning(self, "Fout", "Kan afbeelding niet openen")
+        self.path = path
+        self.target_size = target_size
+        self.signals = self.Signals()
+
+    def run(self):
+        reader = QImageReader(self.path)
+        src_size = reader.size()
+        if src_size.isValid():
+            reader.setScaledSize(src_size.scaled(self.target_size, Qt.KeepAspectRatio))
+        self.signals.loaded.emit(reader.read())
+
+class DuplicateGroupModel(QAbstractListModel):
+    """Model voor de afbeeldingen van één duplicate groep
+
+    Thumbnails worden pas gedecodeerd wanneer de view er om vraagt en
+    dat gebeurt op de thread pool; tot de decode klaar is tekent de
+    view alleen de tekst en blijft de GUI-thread vrij.
+    """
+
+    PathRole = Qt.UserRole + 1
+
+    def __init__(self, images, parent=None):
+        super().__init__(parent)
+        self.images = images
+        self._thumbs = {}      # rij -> QPixmap
+        self._requested = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.images)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        img = self.images[index.row()]
+
+        if role == Qt.DisplayRole:
+            size_kb = round(img.get("file_size", 0) / 1024)
+            size_text = f"{size_kb} KB" if size_kb < 1024 else f"{round(size_kb/1024, 1)} MB"
+            return f"{img['filename'][:20]}\n{img.get('resolution', 'unknown')} • {size_text}"
+        if role == Qt.DecorationRole:
+            row = index.row()
+            pixmap = self._thumbs.get(row)
+            if pixmap is None and row not in self._requested:
+                self._request_thumbnail(row, img)
+            return pixmap
+        if role == self.PathRole or role == Qt.ToolTipRole:
+            return img["path"]
+        return None
+
+    def _request_thumbnail(self, row, img):
+        """Start een asynchrone decode voor deze rij"""
+        self._requested.add(row)
+
+        # Laad de kleine cache-thumbnail in plaats van het origineel
+        thumb_path = img.get("thumb_path")
+        if not thumb_path or not os.path.exists(thumb_path):
+            thumb_path = img["path"]
+        loader = ThumbnailLoader(thumb_path, QSize(180, 110))
+        loader.signals.loaded.connect(partial(self._thumbnail_ready, row))
+        QThreadPool.globalInstance().start(loader)
+
+    def _thumbnail_ready(self, row, image):
+        """Decode klaar: pixmap cachen en de view bijwerken"""
+        if image.isNull() or row >= len(self.images):
+            return
+        self._thumbs[row] = QPixmap.fromImage(image)
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
 
 class DuplicatePhotoManager(QMainWindow):
     """Hoofdapplicatie"""
@@ -345,6 +619,7 @@ class DuplicatePhotoManager(QMainWindow):
         self.scan_thread = None
         self.duplicates = []
         self.current_group = 0
+        self.group_model = None
         self.db_path = "duplicates.db"
         
         self.setup_ui()
@@ -500,18 +775,26 @@ class DuplicatePhotoManager(QMainWindow):
         
         layout.addLayout(nav_layout)
         
-        # Images
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("QScrollArea { border: 1px solid #444; border-radius: 8px; background: #2a2a2a; }")
-        
-        self.scroll_content = QWidget()
-        self.images_layout = QGridLayout(self.scroll_content)
-        self.images_layout.setSpacing(10)
-        
-        self.scroll_area.setWidget(self.scroll_content)
-        layout.addWidget(self.scroll_area)
-        
+        # Images - model/view met lazy thumbnails, geen widget per kaart
+        self.images_view = QListView()
+        self.images_view.setViewMode(QListView.IconMode)
+        self.images_view.setIconSize(QSize(180, 110))
+        self.images_view.setGridSize(QSize(200, 170))
+        self.images_view.setResizeMode(QListView.Adjust)
+        self.images_view.setSpacing(10)
+        self.images_view.setUniformItemSizes(True)
+        self.images_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.images_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.images_view.doubleClicked.connect(self.open_image)
+        self.images_view.setStyleSheet("QListView { border: 1px solid #444; border-radius: 8px; background: #2a2a2a; }")
+        layout.addWidget(self.images_view)
+
+        # Verwijderen werkt op de selectie (alles is verwijderbaar)
+        delete_btn = QPushButton("Verwijder geselecteerde")
+        delete_btn.setStyleSheet("QPushButton { background: #cc3333; } QPushButton:hover { background: #dd4444; }")
+        delete_btn.clicked.connect(self.delete_selected)
+        layout.addWidget(delete_btn)
+
         return widget
     
     def browse_folder(self):
@@ -658,48 +941,58 @@ class DuplicatePhotoManager(QMainWindow):
     
     def show_current_group(self):
         """Toon huidige groep"""
-        # Clear layout
-        while self.images_layout.count():
-            item = self.images_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
         if not self.duplicates or self.current_group >= len(self.duplicates):
+            self.group_model = None
+            self.images_view.setModel(None)
             return
-        
-        # Toon afbeeldingen
-        images = self.duplicates[self.current_group]
-        for i, img_data in enumerate(images):
-            card = ImageCard(img_data)
-            card.deleteRequested.connect(self.delete_image)
-            
-            row, col = divmod(i, 4)  # 4 kolommen
-            self.images_layout.addWidget(card, row, col)
-    
-    def delete_image(self, file_path):
-        """Verwijder afbeelding"""
+
+        # Nieuw model per groep; de view vraagt zelf thumbnails op
+        self.group_model = DuplicateGroupModel(self.duplicates[self.current_group], self)
+        self.images_view.setModel(self.group_model)
+
+    def open_image(self, index):
+        """Open afbeelding in standaard app"""
+        file_path = index.data(DuplicateGroupModel.PathRole)
+        try:
+            if platform.system() == "Darwin":
+                subprocess.run(["open", file_path])
+            elif platform.system() == "Windows":
+                os.startfile(file_path)
+            else:
+                subprocess.run(["xdg-open", file_path])
+        except OSError:
+            QMessageBox.warning(self, "Fout", "Kan afbeelding niet openen")
+
+    def delete_selected(self):
+        """Verwijder de geselecteerde afbeeldingen"""
+        indexes = self.images_view.selectedIndexes()
+        if not indexes:
+            return
+
+        paths = [index.data(DuplicateGroupModel.PathRole) for index in indexes]
         reply = QMessageBox.question(
-            self, 
+            self,
             "Bevestigen",
-            f"Weet je zeker dat je '{os.path.basename(file_path)}' wilt verwijderen?",
+            f"Weet je zeker dat je {len(paths)} bestand(en) wilt verwijderen?",
             QMessageBox.Yes | QMessageBox.No
         )
-        
+
         if reply == QMessageBox.Yes:
             try:
-                # Verwijder bestand
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                
-                # Update database
                 with sqlite3.connect(self.db_path) as conn:
-                    conn.execute("UPDATE images SET is_deleted = TRUE WHERE path = ?", (file_path,))
-                
-                QMessageBox.information(self, "Verwijderd", f"Bestand verwijderd: {os.path.basename(file_path)}")
-                
+                    for file_path in paths:
+                        # Verwijder bestand
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+
+                        # Update database
+                        conn.execute("UPDATE images SET is_deleted = TRUE WHERE path = ?", (file_path,))
+
+                QMessageBox.information(self, "Verwijderd", f"{len(paths)} bestand(en) verwijderd")
+
                 # Herlaad resultaten
                 self.load_existing_results()
-                
+
             except Exception as e:
                 QMessageBox.critical(self, "Fout", f"Kon bestand niet verwijderen: {str(e)}")
 